@@ -1,12 +1,16 @@
-from abc import ABC, abstractmethod
+import functools
 
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import permissions, status
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated, DjangoModelPermissions
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from utils import (
+from .utils import (
     date_or_datetime,
     datetime_from_web,
 )
@@ -29,10 +33,43 @@ class DjangoModelPermissionsStrict(DjangoModelPermissions):
     }
 
 
+@functools.lru_cache(maxsize=1024)
+def _cached_time_param(value, timezone_name):
+    """
+    returns the date or datetime for a time url parameter, or None if it is invalid
+    Cached since clients often repeat the same time (ie. while paginating). timezone_name is part of the key
+    because naive values are made aware in the current timezone.
+    """
+    return date_or_datetime(datetime_from_web(value))
+
+
+def _parse_time_param(value):
+    """
+    returns the date or datetime for a time url parameter, or None if it is not given or invalid
+    """
+    if not value:
+        return None
+    return _cached_time_param(value, timezone.get_current_timezone_name())
+
+
+# permission classes are stateless, so a single instance is shared for the fallback checks
+_STRICT_PERMS = DjangoModelPermissionsStrict()
+
+
+@functools.lru_cache(maxsize=None)
 def get_pita_permissions_class(model_class):
     """
     returns a class to handle default permissions on a PITA model, given that model
+    The class is built once per model and reused on later calls.
     """
+    # the permission codenames are fixed for the lifetime of the model, so map each PITA action to its permission once
+    purge_perm = f"{model_class._meta.app_label}.purge_{model_class._meta.model_name}"
+    rollback_perm = f"{model_class._meta.app_label}.rollback_{model_class._meta.model_name}"
+    action_perms = {
+        "purge": purge_perm,
+        "rollback": rollback_perm,
+        "bulk_rollback": rollback_perm,
+    }
 
     class PointInTimeModelPermissions(permissions.BasePermission):
         """
@@ -41,33 +78,33 @@ def get_pita_permissions_class(model_class):
         """
 
         def has_permission(self, request, view):
-            if view.action == "purge":
-                return request.user.has_perm(
-                    model_class._meta.app_label
-                    + ".purge_"
-                    + model_class._meta.model_name
-                )
-            elif view.action == "rollback":
-                return request.user.has_perm(
-                    model_class._meta.app_label
-                    + ".rollback_"
-                    + model_class._meta.model_name
-                )
+            perm = action_perms.get(view.action)
+            if perm is not None:
+                return request.user.has_perm(perm)
 
-            return DjangoModelPermissionsStrict().has_permission(request, view)
+            return _STRICT_PERMS.has_permission(request, view)
 
     return PointInTimeModelPermissions
 
 
-class PointInTimeModelViewSet(ModelViewSet, ABC):
+@functools.lru_cache(maxsize=None)
+def get_pita_permissions(model_class):
     """
-    This Abstract Class handles PITA specifics including defaulting to objects manager and active rows if
+    returns the default permission instances for a PITA model viewset, given the model
+    These instances are built once per model and shared by every request.
+    """
+    return (IsAuthenticated(), get_pita_permissions_class(model_class)())
+
+
+class PointInTimeModelViewSet(ModelViewSet):
+    """
+    This Class handles PITA specifics including defaulting to objects manager and active rows if
     time is specified, provides hisotry endpoint for table at past state,
     and sets user to modified_by on update and create
     This should generally be used instead of base ModelViewSet for any PITA model
 
-    Note: It is REQUIRED that subclasses specify a filter_queryset method. This can
-    simply return the same queryset if further filtering based on the request is not needed.
+    Note: subclasses can override filter_queryset to filter based on the request. By default, it
+    applies the viewset's filter_backends, like the usual GenericAPIView.filter_queryset.
 
     This provides actions for purge and for rollback, which by default requre the purge_modelname or rollback_modelname permissions
     respectively. You can require different conditions or disable them altogether by overriding get_permissions.
@@ -91,13 +128,20 @@ class PointInTimeModelViewSet(ModelViewSet, ABC):
 
     model_class = None
 
-    @abstractmethod
-    def filter_queryset(self, queryset, *args, **kwargs):
+    # related fields to eager load on GET querysets, to avoid N+1 queries from the serializer
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    # if specified, GET querysets only load these columns (include the pk and any ForeignKey used by select_related_fields)
+    only_fields = ()
+
+    def filter_queryset(self, queryset):
         """
         This will be called for any queryset used by the class.
-        This is where a subclass should filter the queryset based on the request.
+        This is where a subclass should filter the queryset based on the request (call super to keep
+        applying filter_backends).
         """
-        pass
+        return super().filter_queryset(queryset)
 
     def get_queryset(self):
         """
@@ -106,26 +150,70 @@ class PointInTimeModelViewSet(ModelViewSet, ABC):
         active at that time
         and if version_at is specified in the GET parameters, this returns 
         the objects as they were in the database at that time
+        select_related_fields, prefetch_related_fields and only_fields are applied to the queryset of GET requests if specified
         """
         if self.model_class is None:
             raise Exception("model must be specified for PointInTimeViewset")
 
-        qs = self.model_class.objects.all()
+        request = self.request
+        model_class = self.model_class
+        qs = model_class.objects.all()
+
+        if request.method != "GET":
+            # querying past versions is only allowed in GET since these cannot be modified,
+            # and other methods (including purge and rollback) only work on a single current object
+            return self.filter_queryset(qs)
 
         # If time is specified, filter to the active fields
-        if self.request.method == "GET":
-            # querying past versions is only allowed in GET since these cannot be modified
-            active_at = date_or_datetime(datetime_from_web(self.request.GET.get("active_at")))
-            version_at = date_or_datetime(datetime_from_web(self.request.GET.get("version_at")))
+        params = request.GET
+        version_at = _parse_time_param(params.get("version_at"))
+        active_at = _parse_time_param(params.get("active_at"))
+
+        if version_at is not None and active_at is not None:
+            qs = model_class.records.version_active(version_at, active_at)
+        elif version_at is not None:
+            qs = model_class.records.version(version_at=version_at)
+        elif active_at is not None:
+            qs = qs.active(active_at=active_at)
+
+        if self.select_related_fields:
+            qs = qs.select_related(*self.select_related_fields)
+        if self.prefetch_related_fields:
+            qs = qs.prefetch_related(*self.prefetch_related_fields)
+        if self.only_fields:
+            qs = qs.only(*self.only_fields)
 
-            if version_at is not None:
-                qs = self.model_class.records.past(past_time=version_at)
+        return self.filter_queryset(qs)
+
+    def list(self, request, *args, **kwargs):
+        """
+        returns the (paginated) serialized objects of get_queryset
+        This is the same as the default list, except that get_queryset has already applied filter_queryset,
+        so it is not applied a second time.
+        """
+        queryset = self.get_queryset()
 
-            if active_at is not None:
-                qs = qs.active(time=active_at)
-            
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
 
-        return self.filter_queryset(qs)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    def get_object(self):
+        """
+        returns the object for detail actions (including purge and rollback)
+        This is the same as the default get_object, except that get_queryset has already applied filter_queryset,
+        so it is not applied a second time.
+        """
+        queryset = self.get_queryset()
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+
+        self.check_object_permissions(self.request, obj)
+        return obj
 
     def get_model_class(self):
         """
@@ -139,11 +227,7 @@ class PointInTimeModelViewSet(ModelViewSet, ABC):
         """
         Use PITAPermissions
         """
-        permission_classes = [
-            IsAuthenticated,
-            get_pita_permissions_class(self.get_model_class()),
-        ]
-        return [permission() for permission in permission_classes]
+        return list(get_pita_permissions(self.get_model_class()))
 
     def perform_create(self, serializer):
         if self.request is not None and self.request.user is not None:
@@ -174,38 +258,130 @@ class PointInTimeModelViewSet(ModelViewSet, ABC):
         Rolls back the object to the state it was in at the time specified in the POST data
         or just to the latest version if time is not specified.
         The fields and exclude parameters are optional and can be used to specify which fields should be rolled back.
-        If specified, time should be in iso format and fields and exclude should be iterables of field names if specified.
+        If specified, time should be in iso format and fields and exclude should be lists of field names if specified.
+        Clients that only need an acknowledgement can pass ?minimal=1 (or a Prefer: return=minimal header) to
+        get an empty 204 response instead of the serialized object.
         """
 
-        time = date_or_datetime(datetime_from_web(request.data.get("time")))
-        fields = request.data.get("fields")
-        exclude = request.data.get("exclude")
+        data = request.data
+        time = date_or_datetime(datetime_from_web(data.get("time")))
+        fields = data.get("fields")
+        exclude = data.get("exclude")
 
-        # validate that fields and exclude are iterable if specified
-        if fields is not None and not hasattr(fields, "__iter__"):
-            return Response(
-                "fields must be iterable", status=status.HTTP_400_BAD_REQUEST
-            )
-
-        if exclude is not None and not hasattr(exclude, "__iter__"):
-            return Response(
-                "exclude must be iterable", status=status.HTTP_400_BAD_REQUEST
-            )
+        error = self._validate_rollback_fields(fields, exclude)
+        if error is not None:
+            return Response(error, status=status.HTTP_400_BAD_REQUEST)
 
         instance = self.get_object()
         if time is None:
-            instance.rollback_latest(fields=fields, exclude=exclude)
+            instance = instance.rollback_latest(fields=fields, exclude=exclude)
         else:
-            instance.rollback_to_at(time, fields=fields, exclude=exclude)
-        try:
-            instance = self.get_object()
-        except Exception as e:
-            # catch situation where object was deleted in rollback
-            instance = None
-
-        if instance is None:
+            instance = instance.rollback_to_at(time, fields=fields, exclude=exclude)
+
+        # the rollback returns None if it deleted the object
+        if instance is None or self._wants_minimal_response(request):
             return Response(status=status.HTTP_204_NO_CONTENT)
 
         serializer = self.get_serializer(instance)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=["post"])
+    def bulk_rollback(self, request, *args, **kwargs):
+        """
+        Rolls back each object with a pk in the ids list of the POST data, all within a single transaction.
+        time, fields and exclude are optional and apply to every object, just as in rollback.
+        Returns the serialized objects that still exist after the rollback, or an empty 204 response
+        for a minimal request (see rollback).
+        If any of the ids is not a valid pk, this returns 400, and if any of the objects is not found (just as
+        rollback would return 404 for it), this returns 404 with the missing ids, without rolling back any object.
+        """
+
+        data = request.data
+        ids = data.get("ids")
+        time = date_or_datetime(datetime_from_web(data.get("time")))
+        fields = data.get("fields")
+        exclude = data.get("exclude")
+
+        pks = self._validate_rollback_ids(ids)
+        if pks is None:
+            return Response("ids must be a list of primary keys", status=status.HTTP_400_BAD_REQUEST)
+
+        error = self._validate_rollback_fields(fields, exclude)
+        if error is not None:
+            return Response(error, status=status.HTTP_400_BAD_REQUEST)
+
+        remaining = []
+        with transaction.atomic():
+            # fetch all the objects in one query, rather than one get_object per object
+            instances = list(self.get_queryset().filter(pk__in=pks))
+            found = {instance.pk for instance in instances}
+            missing = [pk for pk in pks if pk not in found]
+            if missing:
+                return Response(
+                    {"detail": "Not found.", "missing": missing},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            for instance in instances:
+                self.check_object_permissions(request, instance)
+                if time is None:
+                    instance = instance.rollback_latest(fields=fields, exclude=exclude)
+                else:
+                    instance = instance.rollback_to_at(time, fields=fields, exclude=exclude)
+
+                # the rollback returns None if it deleted the object
+                if instance is not None:
+                    remaining.append(instance)
+
+        if self._wants_minimal_response(request):
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        serializer = self.get_serializer(remaining, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def _validate_rollback_ids(self, ids):
+        """
+        returns the ids from the request data converted to primary key values (without duplicates),
+        or None if ids is not a list of valid primary keys
+        """
+        if not isinstance(ids, (list, tuple)):
+            return None
+
+        pk_field = self.get_model_class()._meta.pk
+        pks = []
+        seen = set()
+        for value in ids:
+            # to_python would turn True into 1 and truncate a float such as 2.9 to 2
+            if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+                return None
+            try:
+                pk = pk_field.to_python(value)
+            except ValidationError:
+                return None
+            if pk is None:
+                return None
+            if pk not in seen:
+                seen.add(pk)
+                pks.append(pk)
+        return pks
+
+    def _validate_rollback_fields(self, fields, exclude):
+        """
+        returns an error message if fields or exclude from the request data are invalid, otherwise None
+        """
+        # fields and exclude must be lists if specified (a string would otherwise be treated as a list of characters)
+        if fields is not None and not isinstance(fields, (list, tuple)):
+            return "fields must be a list"
+
+        if exclude is not None and not isinstance(exclude, (list, tuple)):
+            return "exclude must be a list"
+
+        return None
+
+    def _wants_minimal_response(self, request):
+        """
+        returns True if the client asked not to receive the serialized objects in the response
+        (?minimal=1 or ?minimal=true, so that ?minimal=0 or ?minimal=false still get them)
+        """
+        minimal = request.query_params.get("minimal", "").lower() in ("1", "true")
+        return minimal or "return=minimal" in request.headers.get("Prefer", "")
@@ -1,23 +1,65 @@
 import datetime
+import functools
 from itertools import chain
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import models, transaction
+from django.db import models, router, transaction
 from django.db.models import Deferrable, UniqueConstraint
 from django.forms import ValidationError
 from django.utils import timezone
 
 
+@functools.lru_cache(maxsize=None)
 def get_one_to_one_fields(model):
     """
-    returns a list of the names of the one to one fields in the model
+    returns a frozenset of the names of the one to one fields in the model
+    The fields of a model do not change, so this is computed once per model.
     """
-    one_to_one_fields = []
-    for field in model._meta.get_fields():
-        if isinstance(field, models.OneToOneField):
-            one_to_one_fields.append(field.name)
-    return one_to_one_fields
+    return frozenset(
+        field.name
+        for field in model._meta.get_fields()
+        if isinstance(field, models.OneToOneField)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_rollback_fields(model):
+    """
+    returns a tuple of (name, attname) pairs for the fields of the model that a rollback can revert
+    this is every concrete and private field except the pk, which the most up to date version must keep in the PITA design
+    The fields of a model do not change, so this is computed once per model.
+    """
+    # based off of model_to_dict implementation https://docs.djangoproject.com/en/3.2/_modules/django/forms/models/
+    opts = model._meta
+    return tuple(
+        (f.name, getattr(f, "attname", f.name))
+        for f in chain(opts.concrete_fields, opts.private_fields)
+        if not f.primary_key
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_frozen_relations(model):
+    """
+    returns a tuple of (accessor name, field name) pairs for the FrozenForeignKey fields (defined on other models) pointing to model,
+    where the accessor name is that of the reverse relation on model and the field name is that of the FrozenForeignKey
+    The fields of a model do not change, so this is computed once per model.
+    """
+    return tuple(
+        (field.get_accessor_name(), field.field.name)
+        for field in model._meta.get_fields()
+        if isinstance(field, models.ForeignObjectRel)
+        and isinstance(field.field, FrozenForeignKey)
+        and field.model == model
+    )
+
+
+def get_frozen_related_names(model):
+    """
+    returns a tuple of the accessor names of the reverse relations of FrozenForeignKey fields (defined on other models) pointing to model
+    """
+    return tuple(accessor_name for accessor_name, _ in get_frozen_relations(model))
 
 
 class FrozenForeignKey(models.ForeignKey):
@@ -32,6 +74,45 @@ class FrozenForeignKey(models.ForeignKey):
     pass
 
 
+_END_OF_DAY = datetime.time.max
+
+
+def as_datetime(value, name="time"):
+    """
+    returns value as a datetime, where a date is treated as the latest time during that day
+    raises ValueError if value is neither a datetime nor a date
+    """
+    if isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, datetime.date):
+        # use the latest time during the provided day
+        return datetime.datetime.combine(value, _END_OF_DAY)
+    raise ValueError(name + " must be datetime or date")
+
+
+# filters that do not depend on the query time are built once
+_END_AT_NULL = models.Q(end_at__isnull=True)
+_REPLACED_AT_NULL = models.Q(replaced_at__isnull=True)
+
+
+def active_filter(active_at=None):
+    """
+    returns a Q filter for the objects that were active as of active_at : date or datetime, default to current datetime
+    """
+    if active_at is None:
+        active_at = timezone.now()
+    active_at = as_datetime(active_at, "active_at")
+    return (_END_AT_NULL | models.Q(end_at__gt=active_at)) & models.Q(start_at__lte=active_at)
+
+
+def version_filter(version_at):
+    """
+    returns a Q filter for the rows as they were at version_at : date or datetime
+    """
+    version_at = as_datetime(version_at, "version_at")
+    return (_REPLACED_AT_NULL | models.Q(replaced_at__gt=version_at)) & models.Q(created_at__lte=version_at)
+
+
 class PointInTimeQuerySet(models.QuerySet):
     def active(self, active_at=None):
         """
@@ -41,20 +122,7 @@ class PointInTimeQuerySet(models.QuerySet):
         set inactive on that day or discluded.
         Note that this does filters out deleted objects but not out out-of-date objects. You may use current.active if you only want most current data.
         """
-        if active_at is None:
-            active_at = timezone.now()
-
-        if not isinstance(active_at, datetime.datetime):
-            if isinstance(active_at, datetime.date):
-                # use the latest time during the provided day
-                active_at = datetime.datetime.combine(active_at, datetime.time.max)
-            else:
-                raise ValueError("active_at must be datetime or date")
-
-        return self.filter(
-            models.Q(end_at__gt=active_at) | models.Q(end_at__isnull=True),
-            start_at__lte=active_at,
-        )
+        return self.filter(active_filter(active_at))
 
     def current(self):
         """
@@ -62,7 +130,7 @@ class PointInTimeQuerySet(models.QuerySet):
         This can include inactive rows (if we currently consider them inactive), but
         will not include past versions of rows that have been edited.
         """
-        return self.filter(replaced_at__isnull=True)
+        return self.filter(_REPLACED_AT_NULL)
 
     def version(self, version_at):
         """
@@ -74,17 +142,15 @@ class PointInTimeQuerySet(models.QuerySet):
         * Note that id (pk) values might be different from how they were at the past time, but row_id will be the same.
         Many-to-Many relationships depend on other models and so their history is not preserved in this one
         """
-        if not isinstance(version_at, datetime.datetime):
-            if isinstance(version_at, datetime.date):
-                # use the latest time during the provided day
-                version_at = datetime.datetime.combine(version_at, datetime.time.max)
-            else:
-                raise ValueError("time must be datetime or date")
+        return self.filter(version_filter(version_at))
 
-        return self.filter(
-            models.Q(replaced_at__gt=version_at) | models.Q(replaced_at__isnull=True),
-            created_at__lte=version_at,
-        )
+    def version_active(self, version_at, active_at=None):
+        """
+        Given a version_at : date or datetime and active_at : date or datetime (default to current datetime),
+        returns: the objects as they were at version_at which were active as of active_at.
+        Equivalent to version(version_at).active(active_at), but builds both conditions in a single filter.
+        """
+        return self.filter(version_filter(version_at), active_filter(active_at))
 
 
 class PointInTimeBaseManager(models.Manager):
@@ -105,7 +171,8 @@ class PointInTimeBaseManager(models.Manager):
         Returns the most up-to-date version of objects that were active as of time.
         Note that a deleted object is considered out of date (inacurrate) for all time, and will not be returned
         """
-        return self.get_queryset().active(active_at).current()
+        # a single filter for both conditions, rather than active().current()
+        return self.get_queryset().filter(_REPLACED_AT_NULL, active_filter(active_at))
 
     def current(self):
         """
@@ -121,16 +188,26 @@ class PointInTimeBaseManager(models.Manager):
 
         * Note that id (pk) values might be different from how they were at the past time, but row_id will be the same
         """
+        self._warn_related_fields()
+        return self.get_queryset().version(version_at)
+
+    def version_active(self, version_at, active_at=None):
+        """
+        Returns the objects as they were at version_at which were active as of active_at (default to current datetime).
+        Equivalent to version(version_at).active(active_at) in a single filter.
+        """
+        self._warn_related_fields()
+        return self.get_queryset().version_active(version_at, active_at)
+
+    def _warn_related_fields(self):
         # Prevent accidental related_field bugs by issuing this exception during tests/development
         if settings.DEBUG and len(self.model._meta.get_fields()) != len(
             self.model._meta.concrete_fields
         ):
             print(
-                "WARNING: Related fields (OneToOne and ManyToMany) to a PITA model object might not work as expected when querying records.past. For these fields, use the current row (changes not tracked)."
+                "WARNING: Related fields (OneToOne and ManyToMany) to a PITA model object might not work as expected when querying records.version. For these fields, use the current row (changes not tracked)."
             )
 
-        return self.get_queryset().version(version_at)
-
 
 
 class PointInTimeDefaultManager(models.Manager):
@@ -157,34 +234,57 @@ class PointInTimeDefaultManager(models.Manager):
         """
         return self.get_queryset().active(active_at)
 
-    def copy(self, pk, exclude=()):
+    def copy(self, pk, exclude=(), **changes):
         """
         Copies the current instance as a new row. Does not copy ManyToMany fields.
         Specify a list of field names in exclude to set these to null in the copy.
         For instance, you should exclude any OneToOne field, as these will otherwise cause a database error.
+        Any other keyword arguments are field values to set on the copy before it is saved.
+        Unless a row_id is given, the copy starts a history of its own (its row_id is its own pk). Since only one version
+        of a row may be current, a copy given the same row_id must also be given a replaced_at.
         Model should be design to use forign key on a factored pk table if those kinds of fields are necessary.
 
+        The row is copied as it is stored in the database, and it is locked (select_for_update) until the end of the
+        transaction, so that it cannot change between being copied and being updated by the caller.
+
         In an alternate design, related objects could be copied, removing the requirement of a factored pk table, but
         breaking the link between reality representations
         https://docs.djangoproject.com/en/4.2/topics/db/queries/#copying-model-instances
         """
+        # the copy is written to the database of this manager (ie. objects.using(...) or db_manager(...)), or else the one the router picks
+        using = self._db or router.db_for_write(self.model, **self._hints)
+        with transaction.atomic(using=using):
+            instance = self.current().using(using).select_for_update().filter(pk=pk).first()
+            if instance is None:
+                # we cannot copy it if the pk does not correspond with a row that is currently in the table
+                return None
+            else:
+                instance.pk = None
+                instance.id = None
+                instance._state.adding = True
 
-        instance = self.current().filter(pk=pk).first()
-        if instance is None:
-            # we cannot copy it if the pk does not correspond with a row that is currently in the table
-            return None
-        else:
-            instance.pk = None
-            instance.id = None
-            instance._state.adding = True
+                # the copy is a separate row unless the caller says which row it is a version of
+                new_row = "row_id" not in changes
+                if new_row:
+                    instance.row_id = None
+
+                for field_name in exclude:
+                    setattr(instance, field_name, None)
+                for field_name, value in changes.items():
+                    setattr(instance, field_name, value)
+
+                instance._save(using=using)
+                if new_row:
+                    instance.row_id = instance.pk
+                    self.model.records.using(using).filter(pk=instance.pk).update(row_id=instance.pk)
 
-            for field_name in exclude:
-                setattr(instance, field_name, None)
+                # now instance is the new row (change variable name for clarity)
+                new_instance = instance
+                return new_instance
 
-            instance._save()
-            # now instance is the new row (change variable name for clarity)
-            new_instance = instance
-            return new_instance
+
+# fields that save sets on every update, so they are always written along with any update_fields
+_SAVE_BOOKKEEPING_FIELDS = frozenset(("created_at", "replaced_at", "modified_by", "start_at"))
 
 
 class PointInTimeModel(models.Model):
@@ -251,6 +351,7 @@ class PointInTimeModel(models.Model):
 
     Note: purge and rollback each get their own permission by default, but if you are specifying permissions in the subclass, you should use
     permissions = PointInTimeModel.Meta.permissions + [your custom permissions]
+    and similarly for indexes and constraints (or have the subclass Meta inherit PointInTimeModel.Meta)
 
     Porting an existing model to PITA:
     -Inherit PointInTimeModel
@@ -281,8 +382,6 @@ class PointInTimeModel(models.Model):
     objects = PointInTimeDefaultManager()
     records = PointInTimeBaseManager()
 
-    # using transaction.atomic with the deferred unique together constraint to allow a row to be copied temporarily during an update
-    @transaction.atomic
     def save(self, user=None, *args, **kwargs):
         """
         If this row does not exist, it gets saved (created) as normal.
@@ -304,54 +403,70 @@ class PointInTimeModel(models.Model):
 
         Note: OneToOne fields are set to null for the past version, to avoid database integrity error, and since
         it is not meaningful to have other related objects linked to an inaccessible (from their end) version of this object.
-        """
-
-        current_time = timezone.now()
 
-        # check if this is an update
-        if self.pk is not None:
-            # updating a row that has already been replaced is illegal
-            assert self.replaced_at is None
-
-            # Copy the original into a new row
-            original = self.copy(exclude=get_one_to_one_fields(self.__class__))
+        If update_fields is given on an update, only those fields (and the PITA fields that save sets) are written to this row,
+        while the past version is still a full copy of the row as it was stored. An empty update_fields does nothing.
+        """
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not update_fields:
+            return
 
-            assert (
-                original is not None
-            )  # this fails if we are trying to edit something that is not in the database
+        # the copy, this row and its row_id are all written to the same database
+        using = kwargs.get("using") or router.db_for_write(self.__class__, instance=self)
+        kwargs["using"] = using
 
-            # Set the replaced_at to the current time
-            original.replaced_at = current_time
+        # using an atomic block with the deferred unique together constraint to allow a row to be copied temporarily during an update
+        with transaction.atomic(using=using):
+            current_time = timezone.now()
 
-            # keep pointer to the current record
-            original.row_id = self.pk
+            # check if this is an update
+            updating = self.pk is not None
+            if updating:
+                # updating a row that has already been replaced is illegal
+                assert self.replaced_at is None
 
-            original._save()
+                # Copy the original into a new row, with replaced_at set to the current time and a pointer to the current record
+                # (these are set before the copy is inserted, so it does not need to be saved again)
+                original = self.__class__.objects.db_manager(using).copy(
+                    self.pk,
+                    exclude=get_one_to_one_fields(self.__class__),
+                    replaced_at=current_time,
+                    row_id=self.pk,
+                )
 
-            # move reverse FrozenForeignKeys to point to the original row
-            self.move_frozen_relationships(original)
-            
-        else:
-            # this is a create, not an update, so ensure row_id is None
-            self.row_id = None
-            self.replaced_at = None
+                assert (
+                    original is not None
+                )  # this fails if we are trying to edit something that is not in the database
 
-        # either this is a completely new row, or an updated one and we already copied the row this replaces, so we can perform regular save now
-        # set default PITA attributes and ignore ones that should not be set by user
-        self.created_at = current_time
-        self.replaced_at = None
-        self.modified_by = (
-            user or self.modified_by
-        )  # override the modified_by attribute only if specified in save call
-
-        self.start_at = self.start_at or current_time
-        self._save()
+                # move reverse FrozenForeignKeys to point to the original row
+                self.move_frozen_relationships(original)
 
-        # if this was a create we have to set the row_id now, after the pk has been assigned
-        if self.row_id is None:
-            self.row_id = self.pk
+                if update_fields is not None:
+                    kwargs["update_fields"] = _SAVE_BOOKKEEPING_FIELDS.union(update_fields)
 
-            self._save()
+            else:
+                # this is a create, not an update, so ensure row_id is None
+                self.row_id = None
+                self.replaced_at = None
+
+            # either this is a completely new row, or an updated one and we already copied the row this replaces, so we can perform regular save now
+            # set default PITA attributes and ignore ones that should not be set by user
+            # (replaced_at is already None in both cases)
+            self.created_at = current_time
+            if user:
+                # override the modified_by attribute only if specified in save call
+                # (this avoids loading the current modified_by user just to assign it back)
+                self.modified_by = user
+
+            if not self.start_at:
+                self.start_at = current_time
+            self._save(*args, **kwargs)
+
+            # if this was a create we have to set the row_id now, after the pk has been assigned
+            # a single column update avoids running a second full save of the row
+            if not updating:
+                self.row_id = self.pk
+                self.__class__.records.using(using).filter(pk=self.pk).update(row_id=self.pk)
 
     def _save(self, *args, **kwargs):
         """
@@ -359,29 +474,30 @@ class PointInTimeModel(models.Model):
         """
         return super().save(*args, **kwargs)
     
+    @classmethod
+    def frozen_related_names(cls):
+        """
+        Returns the names of the reverse relations of FrozenForeignKey fields pointing to this model.
+        When processing many objects that use them, pass these to prefetch_related to avoid a query per object, ie.
+        MyModel.objects.prefetch_related(*MyModel.frozen_related_names())
+        """
+        return get_frozen_related_names(cls)
+
     def move_frozen_relationships(self, target):
         """
         For any FrozenForeignKey fields defined on other models pointing to self, set them to instead point to target.
-        Calls _save on related PITA objects instead of save to avoid creating an artifical version change to the row.
+        The related rows are changed with a single update query per field, which (like _save on a PITA model) does not
+        create an artifical version change to related PITA rows. Note that save signals are not sent for the related objects.
         """
         assert self.__class__ == target.__class__
 
-        for field in self._meta.get_fields():
-            # look for FrozenForeignKey fields that point to self
-            # hasattr(field, "field") is a check to see if this is a related field
-            if hasattr(field, "field") and isinstance(field.field, FrozenForeignKey) and field.model == self.__class__:
-                related_name = field.related_name or field.name + "_set"
-                related_manager = getattr(self, related_name)
-                for related in related_manager.all():
-                    setattr(related, field.field.name, target)
-                    # if the other model is PITA, we do not want to use PITA save, as that creates an
-                    # artifical version change to the row
-                    # but in reality, the target row is what that object was linking to the whole time
-                    if isinstance(related, PointInTimeModel):
-                        related._save()
-                    else:
-                        related.save()
-                
+        # FrozenForeignKey fields that point to self (found once per model)
+        for related_name, field_name in get_frozen_relations(self.__class__):
+            related_manager = getattr(self, related_name)
+            # if the other model is PITA, we do not want to use PITA save, as that creates an
+            # artifical version change to the row
+            # but in reality, the target row is what that object was linking to the whole time
+            related_manager.update(**{field_name: target})
 
     def delete(self, *args, **kwargs):
         """
@@ -391,8 +507,10 @@ class PointInTimeModel(models.Model):
         current_time = timezone.now()
         self.replaced_at = current_time
 
-        # update the row with these changes
-        self._save()
+        # update just replaced_at, rather than saving every column of the row
+        # (in the database this object came from, as the usual Model delete would)
+        using = kwargs.get("using") or router.db_for_write(self.__class__, instance=self)
+        self.__class__.records.using(using).filter(pk=self.pk).update(replaced_at=current_time)
 
     def _delete(self, *args, **kwargs):
         """
@@ -401,27 +519,36 @@ class PointInTimeModel(models.Model):
         """
         super().delete(*args, **kwargs)
 
-    @transaction.atomic
-    def purge(self, *args, **kwargs):
+    def purge(self, using=None, keep_parents=False):
         """
         Permanently deletes all versions of this row from the database.
+        using and keep_parents are the same as for the usual Model delete, and apply to every version of the row.
         """
-        # delete all previous versions of this row
-        for record in self.__class__.records.filter(row_id=self.row_id).exclude(
-            pk=self.pk
-        ):
-            record._delete(*args, **kwargs)
+        using = using or router.db_for_write(self.__class__, instance=self)
+        previous_versions = (
+            self.__class__.records.using(using).filter(row_id=self.row_id).exclude(pk=self.pk)
+        )
+        with transaction.atomic(using=using):
+            if keep_parents:
+                # a queryset delete cannot keep the parent rows, so delete the previous versions one at a time
+                for version in previous_versions:
+                    version._delete(using=using, keep_parents=True)
+            else:
+                # delete all previous versions of this row in a single query
+                # (a queryset delete still handles on_delete behavior of related objects)
+                previous_versions.delete()
 
-        # delete this row
-        self._delete(*args, **kwargs)
+            # delete this row
+            self._delete(using=using, keep_parents=keep_parents)
 
-    def copy(self, exclude=()):
+    def copy(self, exclude=(), **changes):
         """
         Alias for PointInTimeModelManager.copy
         copies this object if it exists and returns the new instance, or None if it did not exist in the db
         Note: you should exclude OneToOne fields to avoid database integrity error
         """
-        return self.__class__.objects.copy(self.pk, exclude=exclude)
+        using = router.db_for_write(self.__class__, instance=self)
+        return self.__class__.objects.db_manager(using).copy(self.pk, exclude=exclude, **changes)
 
     def clean(self):
         """
@@ -441,14 +568,13 @@ class PointInTimeModel(models.Model):
         this permanently deletes rows in between the current and the one rolling back to.
         If this has not been modified at or since the time provided, this does nothing.
         If fields is specified, it only reverts those fields, and if exlcude is specified it avoids reverting any of those fields.
+        Returns this object, or None if the rollback deleted it (ie. it did not exist at the time provided).
         """
         # this should be the most up to date version of the row
-        assert (
-            self.__class__.records.filter(
-                row_id=self.row_id, created_at__gte=self.created_at
-            ).count()
-            == 1
-        )
+        # (an exists query stops at the first newer version instead of counting them all, and the check is skipped under python -O)
+        assert not self.__class__.records.filter(
+            row_id=self.row_id, created_at__gt=self.created_at
+        ).exists()
 
         # rollback to the latest version created at or before the time
         target = (
@@ -459,7 +585,8 @@ class PointInTimeModel(models.Model):
 
         if target is None:
             # this row did not exist at the time, so purge it
-            return self.purge()
+            self.purge()
+            return None
 
         elif target.pk == self.pk:
             # this is already the version we want, so do nothing
@@ -474,7 +601,7 @@ class PointInTimeModel(models.Model):
         If fields is specified, this only reverts those specified fields, and if exclude
         is specified, it avoids reverting those fields.
         If this row has never been changed, this simply permanently deletes it.
-
+        Returns this object, or None if the rollback deleted it.
         """
         # get the latest previous version of this row
         previous = (
@@ -485,7 +612,8 @@ class PointInTimeModel(models.Model):
         )
 
         if previous is None:
-            return self._delete()
+            self._delete()
+            return None
 
         return self._rollback_to(previous, fields=fields, exclude=exclude)
 
@@ -499,6 +627,7 @@ class PointInTimeModel(models.Model):
 
         Note: this does not affect many-to-many relationships, as these are not stored in this table.
         Also note, this does not rollback OneToOne relationships, since these were set to null in the past versions.
+        Returns this object.
         """
         if self.pk == previous.pk:
             raise Exception("Cannot rollback to the same version of a row")
@@ -510,20 +639,18 @@ class PointInTimeModel(models.Model):
         assert self.created_at > previous.created_at
 
         # add one to one fields to exclude
-        exclude = list(exclude or []) + get_one_to_one_fields(self.__class__)
+        fields = None if fields is None else frozenset(fields)
+        one_to_one_fields = get_one_to_one_fields(self.__class__)
+        exclude = one_to_one_fields.union(exclude) if exclude else one_to_one_fields
 
         # copy values from the previous version to this one
-        # based off of model_to_dict implementation https://docs.djangoproject.com/en/3.2/_modules/django/forms/models/
-        opts = self._meta
-        for f in chain(opts.concrete_fields, opts.private_fields):
-            if fields is not None and f.name not in fields:
-                continue
-            if exclude is not None and f.name in exclude:
+        # copying by attname sets ForeignKeys by their id without loading the related objects
+        for name, attname in get_rollback_fields(self.__class__):
+            if fields is not None and name not in fields:
                 continue
-            if f.primary_key:
-                # do not revert the pk since the most up to date version must keep the same pk consistent in PITA design
+            if name in exclude:
                 continue
-            setattr(self, f.name, getattr(previous, f.name))
+            setattr(self, attname, getattr(previous, attname))
 
         # set the replaced_at to None since this is now the most recent version
         self.replaced_at = None
@@ -536,11 +663,11 @@ class PointInTimeModel(models.Model):
 
         # delete all intermediate versions (which now means all that have created_at after this reverted one)
         # Note: using gte to insure that previous itself is deleted since it temporarily has the same created_at value as this
-        for i in self.__class__.records.filter(created_at__gte=self.created_at, row_id=self.row_id).exclude(
+        self.__class__.records.filter(created_at__gte=self.created_at, row_id=self.row_id).exclude(
             pk=self.pk
-        ):
-            i._delete()
-        return self._save()
+        ).delete()
+        self._save()
+        return self
 
     class Meta:
         abstract = True
@@ -550,7 +677,22 @@ class PointInTimeModel(models.Model):
                 fields=["row_id", "created_at"],
                 name="%(class)s_unique_together_row_id_and_created_at",
                 deferrable=Deferrable.DEFERRED,
-            )
+            ),
+            # only one version of a row can be current; this is also a small index of just the current rows
+            # for the row_id lookups of objects (not supported on MySQL, where the constraint is skipped)
+            UniqueConstraint(
+                fields=["row_id"],
+                condition=models.Q(replaced_at__isnull=True),
+                name="%(class)s_unique_current_row_id",
+            ),
+        ]
+        # indexes for the columns filtered on by current, active and version, and by the
+        # history lookups of a row (purge, rollback) which also cover past versions
+        indexes = [
+            models.Index(fields=["row_id", "created_at"]),
+            models.Index(fields=["replaced_at"]),
+            models.Index(fields=["start_at", "end_at"]),
+            models.Index(fields=["created_at", "replaced_at"]),
         ]
         # add purge and rollback permissions
         default_permissions = ("add", "change", "delete", "view", "purge", "rollback")
@@ -1,41 +1,54 @@
 import datetime
 from django.utils import timezone
 
+_MIDNIGHT = datetime.time.min
+
 def date_or_datetime(value):
     """
     given either a datetime or a date, this returns the date unless time is specified
     """
-    if not isinstance(value, datetime.datetime):
-        if value is None or isinstance(value, datetime.date):
-            return value
-        raise TypeError("value must be a datetime or date object")
-
-    if value.time() == datetime.time.min:
-        return value.date()
+    if value is None:
+        return value
 
-    return value
+    if isinstance(value, datetime.datetime):
+        if value.time() == _MIDNIGHT:
+            return value.date()
+        return value
 
-def datetime_from_web(date):
-    """
-    returns a timezone aware datetime or None if invalid
-    if date is of isoformat, this simply returns the datetime of it
-    if it is of the form yyyy-mm-dd (standard from web form), this gives it time 00:00:00
+    if isinstance(value, datetime.date):
+        return value
+    raise TypeError("value must be a datetime or date object")
 
-    """
-    if type(date) is datetime.datetime:
-        return timezone.make_aware(date)
+def _aware_datetime(date):
+    if timezone.is_aware(date):
+        return date
+    return timezone.make_aware(date)
 
-    if type(date) is datetime.date:
-        return timezone.make_aware(
-            datetime.datetime.combine(date, datetime.time(0, 0, 0, 0))
-        )
+def _aware_start_of_day(date):
+    return timezone.make_aware(datetime.datetime.combine(date, _MIDNIGHT))
 
+def _parse_iso(date):
     try:
         date = datetime.datetime.fromisoformat(date)
     except (ValueError, TypeError) as e:
-        date = None
+        return None
 
-    if date is not None and not timezone.is_aware(date):
+    if not timezone.is_aware(date):
         date = timezone.make_aware(date)
+    return date
 
-    return date
\ No newline at end of file
+# how datetime_from_web converts each type of value; anything else is parsed as an iso format string
+_FROM_WEB = {
+    str: _parse_iso,
+    datetime.datetime: _aware_datetime,
+    datetime.date: _aware_start_of_day,
+}
+
+def datetime_from_web(date):
+    """
+    returns a timezone aware datetime or None if invalid
+    if date is of isoformat, this simply returns the datetime of it
+    if it is of the form yyyy-mm-dd (standard from web form), this gives it time 00:00:00
+
+    """
+    return _FROM_WEB.get(type(date), _parse_iso)(date)
@@ -0,0 +1,30 @@
+"""
+Django settings for running the django-pita test suite, ie. pytest (add -n auto to run the test classes in parallel)
+Note that sqlite skips the deferrable constraint used by PointInTimeModels, so also run the suite against Postgres before a release.
+"""
+
+SECRET_KEY = "django-pita-tests"
+
+USE_TZ = True
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "tests",
+]
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    },
+    # a second database, for the tests that check PITA writes go to the database an object came from
+    "other": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    },
+}
+
+DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
+
+ROOT_URLCONF = "tests.urls"
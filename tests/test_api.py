@@ -0,0 +1,265 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from pita.api import get_pita_permissions
+
+from .models import DummyPITAModel
+
+
+class PointInTimeModelViewSetTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(
+            username="admin", password=None
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def edited_dummy(self, *values):
+        # returns a dummy saved once with each of the values for c1
+        dummy = DummyPITAModel.objects.create(c1=values[0])
+        for value in values[1:]:
+            dummy.c1 = value
+            dummy.save()
+        return dummy
+
+
+class TimeParameterTest(PointInTimeModelViewSetTestCase):
+    url = "/dummies/"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.created = datetime.datetime(2024, 1, 1, 10, tzinfo=datetime.timezone.utc)
+        cls.ended = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.timezone.utc)
+        cls.edited = datetime.datetime(2024, 1, 1, 14, tzinfo=datetime.timezone.utc)
+
+        # a row edited from Old to New at 14:00, and a row that stopped being active at 12:00
+        dummy = DummyPITAModel.objects.create(c1="Old")
+        dummy.c1 = "New"
+        dummy.save()
+        DummyPITAModel.records.filter(row_id=dummy.pk).update(start_at=cls.created)
+        DummyPITAModel.records.filter(row_id=dummy.pk).exclude(pk=dummy.pk).update(
+            created_at=cls.created, replaced_at=cls.edited
+        )
+        DummyPITAModel.records.filter(pk=dummy.pk).update(created_at=cls.edited)
+        DummyPITAModel.objects.create(c1="Ended", start_at=cls.created, end_at=cls.ended)
+        DummyPITAModel.records.filter(c1="Ended").update(created_at=cls.created)
+
+    def listed(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(obj["c1"] for obj in response.data)
+
+    def test_list_without_time_returns_current_rows(self):
+        self.assertEqual(self.listed(), ["Ended", "New"])
+
+    def test_list_version_at(self):
+        at = (self.ended + timezone.timedelta(hours=1)).isoformat()
+        self.assertEqual(self.listed(version_at=at), ["Ended", "Old"])
+
+    def test_list_active_at(self):
+        at = (self.ended + timezone.timedelta(hours=1)).isoformat()
+        self.assertEqual(self.listed(active_at=at), ["New"])
+
+    def test_list_version_at_and_active_at(self):
+        at = (self.ended + timezone.timedelta(hours=1)).isoformat()
+        self.assertEqual(self.listed(version_at=at, active_at=at), ["Old"])
+
+    def test_naive_time_is_read_in_the_current_timezone(self):
+        # the same naive time is 13:00 UTC in UTC but 04:00 UTC in Tokyo, before either row was created
+        with timezone.override("UTC"):
+            self.assertEqual(self.listed(version_at="2024-01-01T13:00"), ["Ended", "Old"])
+        with timezone.override("Asia/Tokyo"):
+            self.assertEqual(self.listed(version_at="2024-01-01T13:00"), [])
+
+
+class FilterBackendTest(PointInTimeModelViewSetTestCase):
+    url = "/filtered-dummies/"
+
+    def test_list_applies_filter_backends_once(self):
+        a = self.edited_dummy("A", "A")
+        self.edited_dummy("B")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {"c1": "A"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([obj["id"] for obj in response.data], [a.pk])
+
+        (list_query,) = [
+            query["sql"] for query in queries if '"tests_dummypitamodel"' in query["sql"]
+        ]
+        self.assertEqual(list_query.count('"c1" ='), 1)
+
+    def test_retrieve_applies_filter_backends(self):
+        a = self.edited_dummy("A")
+
+        self.assertEqual(self.client.get(f"{self.url}{a.pk}/", {"c1": "A"}).status_code, 200)
+        self.assertEqual(self.client.get(f"{self.url}{a.pk}/", {"c1": "B"}).status_code, 404)
+
+
+class BulkRollbackTest(PointInTimeModelViewSetTestCase):
+    url = "/dummies/bulk_rollback/"
+
+    def test_bulk_rollback_rolls_back_each_object(self):
+        a = self.edited_dummy("A1", "A2")
+        b = self.edited_dummy("B1", "B2")
+
+        response = self.client.post(self.url, {"ids": [a.pk, b.pk]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(obj["c1"] for obj in response.data), ["A1", "B1"])
+        self.assertEqual(DummyPITAModel.objects.get(pk=a.pk).c1, "A1")
+        self.assertEqual(DummyPITAModel.objects.get(pk=b.pk).c1, "B1")
+
+    def test_bulk_rollback_leaves_out_deleted_objects(self):
+        a = self.edited_dummy("A1", "A2")
+        b = self.edited_dummy("B1")
+
+        response = self.client.post(self.url, {"ids": [a.pk, b.pk]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([obj["id"] for obj in response.data], [a.pk])
+        self.assertFalse(DummyPITAModel.records.filter(row_id=b.pk).exists())
+
+    def test_bulk_rollback_rejects_invalid_ids(self):
+        a = self.edited_dummy("A1", "A2")
+
+        for ids in (a.pk, "not a list", [a.pk, "abc"], [None], [True], [a.pk + 0.9]):
+            response = self.client.post(self.url, {"ids": ids}, format="json")
+            self.assertEqual(response.status_code, 400, ids)
+        self.assertEqual(DummyPITAModel.objects.get(pk=a.pk).c1, "A2")
+
+    def test_bulk_rollback_with_missing_ids_rolls_back_nothing(self):
+        a = self.edited_dummy("A1", "A2")
+        b = self.edited_dummy("B1", "B2")
+        b.delete()
+
+        response = self.client.post(
+            self.url, {"ids": [a.pk, b.pk, a.pk + b.pk]}, format="json"
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data["missing"], [b.pk, a.pk + b.pk])
+        self.assertEqual(DummyPITAModel.objects.get(pk=a.pk).c1, "A2")
+
+    def test_bulk_rollback_accepts_string_ids(self):
+        a = self.edited_dummy("A1", "A2")
+
+        response = self.client.post(self.url, {"ids": [str(a.pk)]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(DummyPITAModel.objects.get(pk=a.pk).c1, "A1")
+
+
+class RollbackResponseTest(PointInTimeModelViewSetTestCase):
+    def rollback_url(self, dummy):
+        return f"/dummies/{dummy.pk}/rollback/"
+
+    def test_rollback_returns_serialized_object(self):
+        dummy = self.edited_dummy("First", "Second")
+
+        response = self.client.post(self.rollback_url(dummy), {}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["id"], dummy.pk)
+        self.assertEqual(response.data["c1"], "First")
+
+    def test_minimal_rollback_returns_empty_204(self):
+        dummy = self.edited_dummy("First", "Second", "Third")
+
+        response = self.client.post(
+            self.rollback_url(dummy) + "?minimal=1", {}, format="json"
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertIsNone(response.data)
+        self.assertEqual(DummyPITAModel.objects.get(pk=dummy.pk).c1, "Second")
+
+        response = self.client.post(
+            self.rollback_url(dummy), {}, format="json", HTTP_PREFER="return=minimal"
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertIsNone(response.data)
+        self.assertEqual(DummyPITAModel.objects.get(pk=dummy.pk).c1, "First")
+
+    def test_rollback_with_minimal_false_returns_serialized_object(self):
+        dummy = self.edited_dummy("First", "Second", "Third", "Fourth")
+
+        for minimal in ("0", "false", "False"):
+            response = self.client.post(
+                self.rollback_url(dummy) + f"?minimal={minimal}", {}, format="json"
+            )
+            self.assertEqual(response.status_code, 200, minimal)
+            self.assertEqual(response.data["id"], dummy.pk)
+
+    def test_rollback_that_deletes_object_returns_204(self):
+        dummy = self.edited_dummy("First")
+
+        response = self.client.post(self.rollback_url(dummy), {}, format="json")
+        self.assertEqual(response.status_code, 204)
+        self.assertIsNone(response.data)
+        self.assertFalse(DummyPITAModel.records.filter(row_id=dummy.pk).exists())
+
+        # the same holds for a rollback to a time before the object was created
+        dummy = self.edited_dummy("First", "Second")
+        response = self.client.post(
+            self.rollback_url(dummy),
+            {"time": (dummy.created_at - timezone.timedelta(days=1)).isoformat()},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(DummyPITAModel.records.filter(row_id=dummy.pk).exists())
+
+    def test_minimal_bulk_rollback_returns_empty_204(self):
+        a = self.edited_dummy("A1", "A2")
+
+        response = self.client.post(
+            "/dummies/bulk_rollback/?minimal=1", {"ids": [a.pk]}, format="json"
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertIsNone(response.data)
+        self.assertEqual(DummyPITAModel.objects.get(pk=a.pk).c1, "A1")
+
+
+class PermissionIsolationTest(PointInTimeModelViewSetTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.denied = get_user_model().objects.create_user(
+            username="denied", password=None
+        )
+        cls.allowed = get_user_model().objects.create_user(
+            username="allowed", password=None
+        )
+        cls.allowed.user_permissions.add(
+            Permission.objects.get(
+                content_type__app_label="tests",
+                codename="rollback_dummypitamodel",
+            )
+        )
+
+    def rollback_as(self, user, dummy):
+        client = APIClient()
+        # a fresh user object for each request, so that django's own permission cache is not shared either
+        client.force_authenticate(get_user_model().objects.get(pk=user.pk))
+        return client.post(f"/dummies/{dummy.pk}/rollback/", {}, format="json")
+
+    def test_denied_request_does_not_affect_the_next(self):
+        dummy = self.edited_dummy("First", "Second", "Third")
+
+        self.assertEqual(self.rollback_as(self.denied, dummy).status_code, 403)
+        self.assertEqual(self.rollback_as(self.allowed, dummy).status_code, 200)
+        self.assertEqual(self.rollback_as(self.denied, dummy).status_code, 403)
+        self.assertEqual(DummyPITAModel.objects.get(pk=dummy.pk).c1, "Second")
+
+    def test_shared_permission_instances_keep_no_request_state(self):
+        dummy = self.edited_dummy("First", "Second")
+        self.rollback_as(self.denied, dummy)
+        self.rollback_as(self.allowed, dummy)
+
+        for permission in get_pita_permissions(DummyPITAModel):
+            self.assertEqual(vars(permission), {})
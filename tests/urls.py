@@ -0,0 +1,9 @@
+from rest_framework.routers import DefaultRouter
+
+from .views import DummyPITAViewSet, FilteredDummyPITAViewSet
+
+router = DefaultRouter()
+router.register("dummies", DummyPITAViewSet, basename="dummy")
+router.register("filtered-dummies", FilteredDummyPITAViewSet, basename="filtered-dummy")
+
+urlpatterns = router.urls
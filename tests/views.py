@@ -0,0 +1,33 @@
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+from pita.api import PointInTimeModelViewSet
+
+from .models import DummyPITAModel
+
+
+class DummyPITASerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DummyPITAModel
+        fields = ["id", "row_id", "c1", "c2", "c3", "start_at", "end_at"]
+
+
+class DummyPITAViewSet(PointInTimeModelViewSet):
+    model_class = DummyPITAModel
+    serializer_class = DummyPITASerializer
+
+
+class C1FilterBackend(BaseFilterBackend):
+    """
+    filters by the c1 url parameter, if given
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        c1 = request.query_params.get("c1")
+        if c1 is None:
+            return queryset
+        return queryset.filter(c1=c1)
+
+
+class FilteredDummyPITAViewSet(DummyPITAViewSet):
+    filter_backends = [C1FilterBackend]